@@ -10,7 +10,8 @@ from app.data_loader import (
     get_correlations,
     get_strengths_weaknesses,
     get_filters_options,
-    AXES_SHORT
+    AXES_SHORT,
+    GROUP_COLUMNS
 )
 
 router = APIRouter()
@@ -39,14 +40,7 @@ async def statistics_by_group(
     - effectif: Par effectif de l'entreprise
     - effectif_dsi: Par effectif de la DSI
     """
-    column_mapping = {
-        "groupe": "Dans quel groupe ton entreprise se situe-t-elle ?",
-        "ca": "Tranche de chiffre d'affaires",
-        "effectif": "Effectif de l'entreprise",
-        "effectif_dsi": "Effectif de la DSI"
-    }
-    
-    col = column_mapping.get(group_by, column_mapping["groupe"])
+    col = GROUP_COLUMNS.get(group_by, GROUP_COLUMNS["groupe"])
     return get_statistics_by_group(col)
 
 
@@ -0,0 +1,60 @@
+"""
+API endpoint d'export des données de maturité IA (CSV, Parquet, XLSX)
+"""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+
+from app.export import DATASETS, MEDIA_TYPES, stream_export
+
+router = APIRouter()
+
+
+@router.get("/export")
+async def export(
+    dataset: List[str] = Query(
+        default=["raw"],
+        description="Jeux de données: raw, global, by_group, correlations, themes (plusieurs possibles en xlsx)"
+    ),
+    format: str = Query(default="csv", description="Format de sortie: csv, parquet, xlsx"),
+    group_by: str = Query(
+        default="groupe",
+        description="Type de groupement pour by_group: groupe, ca, effectif, effectif_dsi"
+    ),
+    groupe: Optional[str] = Query(default=None, description="Filtre sur le type d'entreprise"),
+    ca: Optional[str] = Query(default=None, description="Filtre sur la tranche de chiffre d'affaires"),
+    effectif: Optional[str] = Query(default=None, description="Filtre sur l'effectif de l'entreprise"),
+    effectif_dsi: Optional[str] = Query(default=None, description="Filtre sur l'effectif de la DSI")
+):
+    """
+    Export des réponses brutes et des agrégats
+
+    Les filtres groupe, ca, effectif et effectif_dsi s'appliquent à tous les jeux de données :
+    les agrégats sont calculés sur les réponses filtrées.
+
+    - raw: Réponses brutes
+    - global: Statistiques globales par axe
+    - by_group: Statistiques par groupe et par axe
+    - correlations: Matrice de corrélation entre axes
+    - themes: Forces et faiblesses classées par thématique
+
+    Le fichier est généré morceau par morceau (StreamingResponse).
+    """
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Format inconnu: {format}")
+
+    unknown = [d for d in dataset if d not in DATASETS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Jeux de données inconnus: {', '.join(unknown)}")
+
+    if format != "xlsx" and len(dataset) > 1:
+        raise HTTPException(status_code=400, detail="Un seul jeu de données par fichier en csv et parquet")
+
+    filters = {"groupe": groupe, "ca": ca, "effectif": effectif, "effectif_dsi": effectif_dsi}
+    filename = f"maturite_ia_{'_'.join(dataset)}.{format}"
+
+    return StreamingResponse(
+        stream_export(dataset, format, filters, group_by),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -5,7 +5,7 @@ import pandas as pd
 import numpy as np
 from google.cloud import firestore
 from functools import lru_cache
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 # Définition des axes de maturité
 AXES = [
@@ -32,6 +32,14 @@ AXES_SHORT = [
 
 COLLECTION_NAME = "survey_responses"
 
+# Colonnes de métadonnées utilisables pour le groupement et le filtrage
+GROUP_COLUMNS = {
+    "groupe": "Dans quel groupe ton entreprise se situe-t-elle ?",
+    "ca": "Tranche de chiffre d'affaires",
+    "effectif": "Effectif de l'entreprise",
+    "effectif_dsi": "Effectif de la DSI"
+}
+
 
 @lru_cache(maxsize=1)
 def load_data() -> pd.DataFrame:
@@ -107,14 +115,16 @@ def get_column_mapping() -> Dict[str, Dict[str, str]]:
     return mapping
 
 
-def get_statistics_by_group(group_col: str) -> Dict[str, Any]:
+def get_statistics_by_group(group_col: str, df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Calcule les statistiques de maturité par groupe
     
     Args:
         group_col: Colonne de groupement (groupe, CA, effectif)
+        df: Réponses à analyser (toutes les réponses si None)
     """
-    df = get_processed_data()
+    if df is None:
+        df = get_processed_data()
     
     result = {}
     
@@ -141,9 +151,10 @@ def get_statistics_by_group(group_col: str) -> Dict[str, Any]:
     return result
 
 
-def get_global_statistics() -> Dict[str, Any]:
-    """Calcule les statistiques globales de maturité"""
-    df = get_processed_data()
+def get_global_statistics(df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Calcule les statistiques globales de maturité (sur df, ou toutes les réponses si None)"""
+    if df is None:
+        df = get_processed_data()
     
     result = {"total_responses": len(df), "axes": {}}
     
@@ -164,9 +175,10 @@ def get_global_statistics() -> Dict[str, Any]:
     return result
 
 
-def get_correlations() -> Dict[str, Any]:
-    """Calcule les corrélations entre les axes de maturité"""
-    df = get_processed_data()
+def get_correlations(df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Calcule les corrélations entre les axes de maturité (sur df, ou toutes les réponses si None)"""
+    if df is None:
+        df = get_processed_data()
     
     niveau_cols = [f"{axe}_niveau" for axe in AXES]
     existing_cols = [c for c in niveau_cols if c in df.columns]
@@ -208,12 +220,16 @@ def get_correlations() -> Dict[str, Any]:
     return result
 
 
-def get_strengths_weaknesses() -> Dict[str, Any]:
+def get_strengths_weaknesses(df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Analyse les forces et faiblesses pour chaque axe
     Regroupe par thématiques communes
+    
+    Args:
+        df: Réponses à analyser (toutes les réponses si None)
     """
-    df = load_data()
+    if df is None:
+        df = load_data()
     mapping = get_column_mapping()
     
     result = {}
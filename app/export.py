@@ -0,0 +1,258 @@
+"""
+Module d'export des données (réponses brutes et agrégats) en CSV, Parquet ou XLSX
+
+Chaque format est produit par un générateur qui émet le fichier morceau par
+morceau, afin de pouvoir être servi par une StreamingResponse sans construire
+le fichier complet en mémoire.
+"""
+import io
+import tempfile
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+from app.data_loader import (
+    get_processed_data,
+    get_global_statistics,
+    get_statistics_by_group,
+    get_correlations,
+    get_strengths_weaknesses,
+    GROUP_COLUMNS
+)
+
+# Nombre de lignes écrites par morceau (CSV, groupes de lignes Parquet)
+CHUNK_ROWS = 500
+
+# Taille des morceaux d'octets envoyés au client
+CHUNK_BYTES = 64 * 1024
+
+# Taille au-delà de laquelle le fichier XLSX temporaire bascule sur disque
+XLSX_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+
+def get_raw_responses(filters: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Retourne les réponses brutes, filtrées sur les colonnes de métadonnées
+
+    Args:
+        filters: Valeur attendue par clé de GROUP_COLUMNS (groupe, ca, effectif, effectif_dsi)
+    """
+    df = get_processed_data()
+
+    for key, value in (filters or {}).items():
+        if value:
+            df = df[df[GROUP_COLUMNS[key]] == value]
+
+    return df.reset_index(drop=True)
+
+
+def global_statistics_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Statistiques globales à plat : une ligne par axe"""
+    stats = get_global_statistics(df)
+
+    rows = []
+    for axe, values in stats["axes"].items():
+        row = {
+            "axe": axe,
+            "moyenne": values["moyenne"],
+            "ecart_type": values["ecart_type"],
+            "min": values["min"],
+            "max": values["max"]
+        }
+        for niveau, count in sorted(values["distribution"].items()):
+            row[f"N{niveau}"] = count
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def group_statistics_table(df: pd.DataFrame, group_by: str = "groupe") -> pd.DataFrame:
+    """Statistiques par groupe à plat : une ligne par couple (groupe, axe)"""
+    col = GROUP_COLUMNS.get(group_by, GROUP_COLUMNS["groupe"])
+    stats = get_statistics_by_group(col, df)
+
+    rows = []
+    for group_value, group_stats in stats.items():
+        for axe, values in group_stats["axes"].items():
+            rows.append({
+                "groupe": group_value,
+                "effectif_groupe": group_stats["count"],
+                "axe": axe,
+                "moyenne": values["moyenne"],
+                "min": values["min"],
+                "max": values["max"]
+            })
+
+    return pd.DataFrame(rows)
+
+
+def correlations_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Matrice de corrélation entre axes, avec l'axe en première colonne"""
+    corr = get_correlations(df)
+
+    if "matrix" not in corr:
+        return pd.DataFrame()
+
+    labels = corr["labels"]
+    matrix = pd.DataFrame(corr["matrix"]).reindex(index=labels, columns=labels)
+    return matrix.rename_axis("axe").reset_index()
+
+
+def themes_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Forces et faiblesses à plat : une ligne par réponse, avec son thème"""
+    analysis = get_strengths_weaknesses(df)
+
+    rows = []
+    for axe, values in analysis.items():
+        for kind in ("forces", "faiblesses"):
+            for theme, responses in values[kind]["themes"].items():
+                for response in responses:
+                    rows.append({
+                        "axe": axe,
+                        "type": kind,
+                        "theme": theme,
+                        "reponse": response
+                    })
+
+    return pd.DataFrame(rows, columns=["axe", "type", "theme", "reponse"])
+
+
+DATASETS = ("raw", "global", "by_group", "correlations", "themes")
+
+
+def build_dataset(name: str, filters: Optional[Dict[str, str]] = None,
+                  group_by: str = "groupe") -> pd.DataFrame:
+    """
+    Construit le DataFrame d'un jeu de données exportable
+    Les agrégats sont calculés sur les réponses filtrées, comme le jeu raw
+    """
+    df = get_raw_responses(filters)
+    if name == "raw":
+        return df
+    if name == "global":
+        return global_statistics_table(df)
+    if name == "by_group":
+        return group_statistics_table(df, group_by)
+    if name == "correlations":
+        return correlations_table(df)
+    return themes_table(df)
+
+
+def _chunks(df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+    """Découpe un DataFrame en tranches de CHUNK_ROWS lignes"""
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield df.iloc[start:start + CHUNK_ROWS]
+
+
+def stream_csv(df: pd.DataFrame) -> Iterator[bytes]:
+    """
+    Génère un fichier CSV morceau par morceau
+    Le BOM UTF-8 permet à Excel de détecter l'encodage des accents
+    """
+    yield df.iloc[:0].to_csv(index=False).encode("utf-8-sig")
+
+    for chunk in _chunks(df):
+        yield chunk.to_csv(index=False, header=False).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Flux d'écriture qui accumule les octets jusqu'à leur lecture par drain()
+    La position est suivie séparément pour que ParquetWriter calcule des offsets corrects
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_parquet(df: pd.DataFrame) -> Iterator[bytes]:
+    """Génère un fichier Parquet, un groupe de lignes par morceau"""
+    sink = _ChunkSink()
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(df):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+
+    # Pied de fichier (métadonnées) écrit à la fermeture
+    yield sink.drain()
+
+
+def stream_xlsx(sheets: Dict[str, pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Génère un classeur XLSX avec une feuille par jeu de données
+
+    Le classeur est écrit en mode write-only d'openpyxl (lignes émises une à une),
+    puis enregistré dans un fichier temporaire qui bascule sur disque au-delà de
+    XLSX_SPOOL_MAX_SIZE : le format zip impose d'écrire l'archive avant de l'envoyer.
+    """
+    wb = Workbook(write_only=True)
+
+    for name, df in sheets.items():
+        ws = wb.create_sheet(title=name[:31])
+        ws.append([str(c) for c in df.columns])
+        for row in df.itertuples(index=False, name=None):
+            ws.append([None if pd.isna(v) else v for v in row])
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE) as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while True:
+            data = tmp.read(CHUNK_BYTES)
+            if not data:
+                break
+            yield data
+
+
+def stream_export(datasets: List[str], fmt: str, filters: Optional[Dict[str, str]] = None,
+                  group_by: str = "groupe") -> Iterator[bytes]:
+    """
+    Point d'entrée de l'export : construit les jeux de données et les sérialise
+    Tout le travail est fait pendant l'itération, donc dans le threadpool de la StreamingResponse
+
+    Args:
+        datasets: Noms de jeux de données (clés de DATASETS), un seul pour CSV et Parquet
+        fmt: Format de sortie (csv, parquet, xlsx)
+        filters: Filtres appliqués aux réponses, avant calcul des agrégats
+        group_by: Type de groupement pour le jeu de données by_group
+    """
+    if fmt == "xlsx":
+        sheets = {name: build_dataset(name, filters, group_by) for name in datasets}
+        yield from stream_xlsx(sheets)
+        return
+
+    df = build_dataset(datasets[0], filters, group_by)
+    if fmt == "parquet":
+        yield from stream_parquet(df)
+    else:
+        yield from stream_csv(df)
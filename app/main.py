@@ -7,7 +7,7 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 import os
 
-from app.api import analysis
+from app.api import analysis, export
 
 app = FastAPI(
     title="Analyse Maturité IA - DSI Agroalimentaires",
@@ -27,6 +27,7 @@ templates = Jinja2Templates(directory=templates_path)
 
 # Include API routes
 app.include_router(analysis.router, prefix="/api", tags=["analysis"])
+app.include_router(export.router, prefix="/api", tags=["export"])
 
 
 @app.get("/", response_class=HTMLResponse)
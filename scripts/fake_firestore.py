@@ -0,0 +1,135 @@
+"""
+Client Firestore factice, en mémoire, pour les tests de charge
+
+Reproduit la partie de l'API de google.cloud.firestore utilisée par
+app/data_loader.py : Client().collection(nom).stream() -> documents avec to_dict().
+Les documents synthétiques ont la même structure que ceux produits par upload_data.py.
+"""
+
+import random
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.data_loader import AXES_SHORT, COLLECTION_NAME
+
+# Valeurs de métadonnées observées dans le questionnaire réel
+GROUPES = [
+    "Producteur de produits agroalimentaires",
+    "Coopérative agricole avec ou sans activité de transformation"
+]
+
+TRANCHES_CA = [
+    "Entre 100 M€ et 500 M€",
+    "Entre 500 M€ et 1,5 mds€",
+    "Plus de 1,5 mds€"
+]
+
+EFFECTIFS_ENTREPRISE = [
+    "Entre 100 et 1000",
+    "Entre 1000 et 5000",
+    "Plus de 5000"
+]
+
+EFFECTIFS_DSI = [
+    "Moins de 10",
+    "Entre 10 et 50",
+    "Entre 50 et 200",
+    "Plus de 200"
+]
+
+# Réponses libres couvrant les thématiques de extract_themes() et la catégorie "Autres"
+FORCES = [
+    "Plan de formation IA déployé auprès des équipes",
+    "Budget dédié voté pour les projets data",
+    "Comité de gouvernance data et IA en place",
+    "Catalogue de données et référentiel produits fiabilisés",
+    "Plateforme cloud mutualisée pour les POC",
+    "Adoption rapide par les équipes métier",
+    "Audit RGPD réalisé sur les traitements IA",
+    "Sponsor fort au niveau du COMEX"
+]
+
+FAIBLESSES = [
+    "Manque de compétences internes en data science",
+    "Coûts d'infrastructure difficiles à justifier",
+    "Pas de stratégie IA formalisée",
+    "Qualité des données de production insuffisante",
+    "Outils hétérogènes selon les sites",
+    "Intégration difficile dans les processus existants",
+    "Risques de sécurité mal évalués",
+    "Initiative complexe du fait de la variabilité des sites"
+]
+
+
+class FakeDocumentSnapshot:
+    """Équivalent minimal de firestore.DocumentSnapshot"""
+
+    def __init__(self, doc_id: str, data: Dict[str, Any]):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+
+class FakeCollection:
+    """Équivalent minimal de firestore.CollectionReference"""
+
+    def __init__(self, docs: List[Dict[str, Any]], latency_ms: float = 0.0):
+        self._docs = docs
+        self._latency_ms = latency_ms
+
+    def stream(self) -> Iterator[FakeDocumentSnapshot]:
+        # Appel bloquant, comme le client gRPC réel
+        if self._latency_ms:
+            time.sleep(self._latency_ms / 1000)
+        for data in self._docs:
+            yield FakeDocumentSnapshot(data["id"], data)
+
+
+class FakeFirestoreClient:
+    """
+    Remplaçant de firestore.Client alimenté par des documents synthétiques
+
+    Args:
+        docs: Documents de la collection survey_responses
+        latency_ms: Latence simulée au début de chaque stream()
+    """
+
+    def __init__(self, docs: List[Dict[str, Any]], latency_ms: float = 0.0):
+        self._collections = {COLLECTION_NAME: docs}
+        self._latency_ms = latency_ms
+        self.project = "fake-project"
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self._collections.get(name, []), self._latency_ms)
+
+
+def generate_document(idx: int, rng: random.Random) -> Dict[str, Any]:
+    """Génère une réponse synthétique au format upload_data.transform_row_to_document"""
+    axes_data = {}
+    for short_name in AXES_SHORT:
+        niveau = rng.choice([0, 1, 2, 2, 3, 3, 4, None])
+        axes_data[short_name] = {
+            "niveau": niveau,
+            "niveau_raw": f"N{niveau} : réponse synthétique" if niveau is not None else None,
+            "force": rng.choice(FORCES + [None]),
+            "faiblesse": rng.choice(FAIBLESSES + [None])
+        }
+
+    return {
+        "id": f"response_{idx:03d}",
+        "metadata": {
+            "groupe": rng.choice(GROUPES),
+            "ca": rng.choice(TRANCHES_CA),
+            "effectif_entreprise": rng.choice(EFFECTIFS_ENTREPRISE),
+            "effectif_dsi": rng.choice(EFFECTIFS_DSI)
+        },
+        "axes": axes_data
+    }
+
+
+def generate_documents(count: int, seed: Optional[int] = 0) -> List[Dict[str, Any]]:
+    """Génère count réponses synthétiques (reproductibles pour une même graine)"""
+    rng = random.Random(seed)
+    return [generate_document(idx, rng) for idx in range(count)]
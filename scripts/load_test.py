@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Test de charge du dashboard contre un Firestore factice
+Exécuter depuis la racine du projet : python scripts/load_test.py
+
+Ce script :
+1. Démarre app.main:app (uvicorn, un seul processus comme sur Cloud Run) dans un
+   sous-processus où firestore.Client est remplacé par un client en mémoire
+   alimenté par N documents synthétiques
+2. Mesure le démarrage à froid : temps jusqu'au premier /health, puis premier
+   chargement du dashboard (qui déclenche load_data)
+3. Rejoue le parcours réel de index.html (page, 4 requêtes parallèles, puis
+   changements de group_by) à des niveaux de concurrence croissants
+4. Affiche débit, latences p50/p95/p99, lag de la boucle d'événements et RSS
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# Ajouter le dossier parent au path pour importer l'application
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+METRICS_PATH = "/__loadtest/metrics"
+
+# Options du sélecteur group-filter de index.html
+GROUP_BY_OPTIONS = ["groupe", "ca", "effectif", "effectif_dsi"]
+
+# Intervalle de mesure du lag de la boucle d'événements (secondes)
+LAG_INTERVAL = 0.05
+
+
+# ---------------------------------------------------------------------------
+# Côté serveur (sous-processus)
+# ---------------------------------------------------------------------------
+
+def read_rss_mb() -> Optional[float]:
+    """RSS courant du processus en Mo (Linux uniquement)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+class LoopMonitor:
+    """
+    Échantillonne en continu le lag de la boucle d'événements et le RSS
+    Le pic de RSS est le maximum des mêmes relevés VmRSS, remis à zéro avec le lag à chaque palier
+    """
+
+    def __init__(self):
+        self.lag_samples: List[float] = []
+        self.peak_rss_mb: Optional[float] = None
+
+    def record_rss(self) -> Optional[float]:
+        rss = read_rss_mb()
+        if rss is not None and (self.peak_rss_mb is None or rss > self.peak_rss_mb):
+            self.peak_rss_mb = rss
+        return rss
+
+    def reset(self):
+        self.lag_samples.clear()
+        self.peak_rss_mb = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.lag_samples.append(max(0.0, loop.time() - start - LAG_INTERVAL))
+            self.record_rss()
+
+
+def serve(port: int, docs: int, seed: int, firestore_latency_ms: float):
+    """Démarre l'application avec le Firestore factice (exécuté dans le sous-processus)"""
+    from unittest import mock
+
+    import uvicorn
+
+    from fake_firestore import FakeFirestoreClient, generate_documents
+
+    client = FakeFirestoreClient(generate_documents(docs, seed), latency_ms=firestore_latency_ms)
+    mock.patch("google.cloud.firestore.Client", return_value=client).start()
+
+    from app.main import app
+
+    monitor = LoopMonitor()
+
+    async def metrics(reset: bool = False):
+        lags = sorted(monitor.lag_samples)
+        rss = monitor.record_rss()
+        peak_rss = monitor.peak_rss_mb
+        if reset:
+            monitor.reset()
+        return {
+            "rss_mb": rss,
+            "peak_rss_mb": peak_rss,
+            "loop_lag_ms": {
+                "p50": round(percentile(lags, 50) * 1000, 1),
+                "p99": round(percentile(lags, 99) * 1000, 1),
+                "max": round((lags[-1] if lags else 0.0) * 1000, 1)
+            }
+        }
+
+    app.add_api_route(METRICS_PATH, metrics, methods=["GET"], include_in_schema=False)
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+
+    async def main():
+        monitor_task = asyncio.create_task(monitor.run())
+        try:
+            await server.serve()
+        finally:
+            monitor_task.cancel()
+
+    asyncio.run(main())
+
+
+# ---------------------------------------------------------------------------
+# Côté client (générateur de charge)
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentile par rang le plus proche sur une liste déjà triée"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 en millisecondes"""
+    values = sorted(latencies)
+    return {f"p{p}": round(percentile(values, p) * 1000, 1) for p in (50, 95, 99)}
+
+
+def free_port() -> int:
+    """Réserve un port TCP libre sur l'interface locale"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ServerProcess:
+    """Instance de l'application lancée dans un sous-processus"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.started_at = time.perf_counter()
+        self.process = subprocess.Popen(
+            [
+                sys.executable, os.path.abspath(__file__), "--serve",
+                "--port", str(self.port),
+                "--docs", str(args.docs),
+                "--seed", str(args.seed),
+                "--firestore-latency-ms", str(args.firestore_latency_ms)
+            ],
+            stdout=subprocess.DEVNULL
+        )
+
+    async def wait_ready(self, client: httpx.AsyncClient, timeout: float = 60.0) -> float:
+        """Attend que /health réponde et retourne le temps de démarrage en secondes"""
+        deadline = self.started_at + timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Le serveur s'est arrêté (code {self.process.returncode})")
+            try:
+                response = await client.get(f"{self.base_url}/health")
+                if response.status_code == 200:
+                    return time.perf_counter() - self.started_at
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+        raise TimeoutError(f"Le serveur n'a pas démarré en {timeout:.0f}s")
+
+    async def metrics(self, client: httpx.AsyncClient, reset: bool = False) -> Dict[str, Any]:
+        response = await client.get(f"{self.base_url}{METRICS_PATH}", params={"reset": reset})
+        return response.json()
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+Record = Tuple[str, float, bool]
+
+
+async def timed_get(client: httpx.AsyncClient, base_url: str, path: str, label: str, records: List[Record]):
+    """Exécute une requête GET et enregistre (endpoint, latence, succès)"""
+    start = time.perf_counter()
+    try:
+        response = await client.get(f"{base_url}{path}")
+        ok = response.status_code == 200
+    except Exception:
+        ok = False
+    records.append((label, time.perf_counter() - start, ok))
+
+
+async def dashboard_session(client: httpx.AsyncClient, base_url: str, rng: random.Random, switches: int,
+                            think_time: float, records: List[Record]):
+    """
+    Rejoue un parcours utilisateur de index.html :
+    page d'accueil, loadAllData() (4 fetch parallèles), puis changements du group-filter
+    """
+    await timed_get(client, base_url, "/", "/", records)
+
+    await asyncio.gather(
+        timed_get(client, base_url, "/api/stats/global", "/api/stats/global", records),
+        timed_get(client, base_url, "/api/stats/by-group?group_by=groupe", "/api/stats/by-group", records),
+        timed_get(client, base_url, "/api/correlations", "/api/correlations", records),
+        timed_get(client, base_url, "/api/strengths-weaknesses", "/api/strengths-weaknesses", records)
+    )
+
+    for _ in range(switches):
+        if think_time:
+            await asyncio.sleep(think_time)
+        group_by = rng.choice(GROUP_BY_OPTIONS)
+        await timed_get(client, base_url, f"/api/stats/by-group?group_by={group_by}",
+                        "/api/stats/by-group", records)
+
+
+def summarize(records: List[Record], elapsed: float, sessions: int) -> Dict[str, Any]:
+    """Agrège les mesures d'un palier (global et par endpoint)"""
+    by_endpoint: Dict[str, List[float]] = {}
+    for label, latency, ok in records:
+        if ok:
+            by_endpoint.setdefault(label, []).append(latency)
+
+    errors = sum(1 for _, _, ok in records if not ok)
+
+    return {
+        "requests": len(records),
+        "errors": errors,
+        "sessions": sessions,
+        "duration_s": round(elapsed, 2),
+        "rps": round(len(records) / elapsed, 1) if elapsed else 0.0,
+        "sessions_per_s": round(sessions / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": latency_summary([lat for _, lat, ok in records if ok]),
+        "endpoints": {label: latency_summary(values) for label, values in sorted(by_endpoint.items())}
+    }
+
+
+async def measure_cold_start(args: argparse.Namespace) -> Dict[str, Any]:
+    """Démarre une instance neuve et mesure le premier chargement du dashboard"""
+    server = ServerProcess(args)
+    try:
+        async with httpx.AsyncClient(timeout=args.timeout) as client:
+            boot_s = await server.wait_ready(client)
+
+            # Premier chargement : déclenche load_data (cache lru vide)
+            records: List[Record] = []
+            start = time.perf_counter()
+            await dashboard_session(client, server.base_url, random.Random(args.seed), 0, 0, records)
+            first_load_s = time.perf_counter() - start
+
+            # Second chargement, cache chaud, pour comparaison
+            start = time.perf_counter()
+            await dashboard_session(client, server.base_url, random.Random(args.seed), 0, 0, [])
+            warm_load_s = time.perf_counter() - start
+
+            metrics = await server.metrics(client)
+    finally:
+        server.stop()
+
+    return {
+        "boot_s": round(boot_s, 3),
+        "first_load_ms": round(first_load_s * 1000, 1),
+        "warm_load_ms": round(warm_load_s * 1000, 1),
+        "first_requests_ms": {label: round(lat * 1000, 1) for label, lat, _ in records},
+        "errors": sum(1 for _, _, ok in records if not ok),
+        "loop_lag_max_ms": metrics["loop_lag_ms"]["max"],
+        "rss_mb": metrics["rss_mb"]
+    }
+
+
+async def run_level(client: httpx.AsyncClient, server: ServerProcess, concurrency: int,
+                    args: argparse.Namespace) -> Dict[str, Any]:
+    """Exécute un palier de charge : concurrency utilisateurs pendant args.duration secondes"""
+    await server.metrics(client, reset=True)
+
+    records: List[Record] = []
+    sessions = 0
+    deadline = time.perf_counter() + args.duration
+
+    async def virtual_user(user_id: int):
+        nonlocal sessions
+        rng = random.Random(args.seed * 100003 + user_id)
+        while time.perf_counter() < deadline:
+            await dashboard_session(client, server.base_url, rng, args.switches,
+                                    args.think_time_ms / 1000, records)
+            sessions += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = {"concurrency": concurrency, **summarize(records, elapsed, sessions)}
+    result.update(await server.metrics(client))
+    return result
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Mesure les démarrages à froid puis les paliers de concurrence"""
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    cold_starts = []
+    for i in range(args.cold_starts):
+        print(f"🧊 Démarrage à froid {i + 1}/{args.cold_starts}...")
+        cold_starts.append(await measure_cold_start(args))
+
+    results = []
+    server = ServerProcess(args)
+    try:
+        limits = httpx.Limits(max_connections=max(levels) * 4, max_keepalive_connections=max(levels) * 4)
+        async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+            await server.wait_ready(client)
+            # Préchauffage : charge les données avant les paliers
+            await dashboard_session(client, server.base_url, random.Random(args.seed), 0, 0, [])
+
+            for concurrency in levels:
+                print(f"🚀 Palier {concurrency} utilisateurs ({args.duration:.0f}s)...")
+                results.append(await run_level(client, server, concurrency, args))
+    finally:
+        server.stop()
+
+    return {
+        "config": {
+            "docs": args.docs,
+            "firestore_latency_ms": args.firestore_latency_ms,
+            "duration_s": args.duration,
+            "switches": args.switches,
+            "think_time_ms": args.think_time_ms
+        },
+        "cold_starts": cold_starts,
+        "levels": results
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    """Affiche le rapport sous forme de tableaux"""
+    config = report["config"]
+    print("\n" + "=" * 100)
+    print(f"📊 RAPPORT DE CHARGE — {config['docs']} documents, "
+          f"latence Firestore {config['firestore_latency_ms']:.0f} ms, "
+          f"{config['switches']} changements de group_by par session")
+    print("=" * 100)
+
+    if report["cold_starts"]:
+        print("\n🧊 Démarrage à froid")
+        print(f"{'#':>3} {'boot (s)':>10} {'1er chargement (ms)':>20} {'chargement chaud (ms)':>22} "
+              f"{'lag max (ms)':>13} {'RSS (Mo)':>9} {'erreurs':>8}")
+        for i, cold in enumerate(report["cold_starts"], 1):
+            print(f"{i:>3} {cold['boot_s']:>10.2f} {cold['first_load_ms']:>20.1f} {cold['warm_load_ms']:>22.1f} "
+                  f"{cold['loop_lag_max_ms']:>13.1f} {cold['rss_mb'] or 0:>9.1f} {cold['errors']:>8}")
+
+    print("\n🚀 Paliers de concurrence")
+    print(f"{'users':>6} {'req/s':>8} {'sess/s':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} "
+          f"{'lag p99':>8} {'lag max':>8} {'RSS (Mo)':>9} {'pic RSS':>8} {'erreurs':>8}")
+    for level in report["levels"]:
+        lat = level["latency_ms"]
+        lag = level["loop_lag_ms"]
+        print(f"{level['concurrency']:>6} {level['rps']:>8.1f} {level['sessions_per_s']:>7.2f} "
+              f"{lat['p50']:>9.1f} {lat['p95']:>9.1f} {lat['p99']:>9.1f} "
+              f"{lag['p99']:>8.1f} {lag['max']:>8.1f} {level['rss_mb'] or 0:>9.1f} "
+              f"{level['peak_rss_mb'] or 0:>8.1f} {level['errors']:>8}")
+
+    if report["levels"]:
+        last = report["levels"][-1]
+        print(f"\n🔎 Détail par endpoint à {last['concurrency']} utilisateurs (ms)")
+        for label, lat in last["endpoints"].items():
+            print(f"   {label:<28} p50 {lat['p50']:>8.1f}   p95 {lat['p95']:>8.1f}   p99 {lat['p99']:>8.1f}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Test de charge du dashboard avec un Firestore factice")
+    parser.add_argument("--docs", type=int, default=40, help="Nombre de réponses synthétiques (défaut: 40)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine des données et des parcours")
+    parser.add_argument("--firestore-latency-ms", type=float, default=0.0,
+                        help="Latence simulée de la lecture Firestore au démarrage à froid")
+    parser.add_argument("--concurrency", default="1,5,10,25,50",
+                        help="Paliers d'utilisateurs simultanés, séparés par des virgules")
+    parser.add_argument("--duration", type=float, default=15.0, help="Durée de chaque palier en secondes")
+    parser.add_argument("--switches", type=int, default=2,
+                        help="Changements de group_by par session après le chargement")
+    parser.add_argument("--think-time-ms", type=float, default=0.0,
+                        help="Pause avant chaque changement de group_by")
+    parser.add_argument("--cold-starts", type=int, default=1, help="Nombre de démarrages à froid mesurés")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout des requêtes HTTP en secondes")
+    parser.add_argument("--output", help="Écrit le rapport complet en JSON dans ce fichier")
+    # Mode interne : lancement du serveur dans le sous-processus
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=8080, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    """Point d'entrée du script"""
+    args = parse_args()
+
+    if args.serve:
+        serve(args.port, args.docs, args.seed, args.firestore_latency_ms)
+        return
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Rapport JSON écrit dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()